@@ -1,79 +1,224 @@
+import atexit
+import io
 import logging
+import logging.handlers
+import os
+import queue
+import reprlib
 import sys
+import threading
 import time
 from functools import wraps
-from datetime import datetime
 
 
-def setup_logger(name="scraper_caixa", log_file="scraper_caixa.log", level=logging.INFO):
-    logger = logging.getLogger(name)
- 
-    if logger.handlers:
-        return logger
+class BufferedFileHandler(logging.FileHandler):
+    def __init__(self, filename, encoding='utf-8', buffer_size=65536, flush_interval=0.2):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        super().__init__(filename, encoding=encoding)
+        
+        self._stop_flusher = threading.Event()
+        self._dirty = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
     
-    logger.setLevel(level)
+    def _open(self):
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_TRUNC if 'w' in self.mode else os.O_APPEND)
+        raw = os.fdopen(os.open(self.baseFilename, flags, 0o644), 'wb', buffering=0)
+        buffered = io.BufferedWriter(raw, buffer_size=self.buffer_size)
+        return io.TextIOWrapper(
+            buffered, encoding=self.encoding, errors=self.errors, write_through=False
+        )
+    
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            self._dirty.set()
+        except Exception:
+            self.handleError(record)
+    
+    def _flush_periodically(self):
+        while True:
+            self._dirty.wait()
+            stopping = self._stop_flusher.wait(self.flush_interval)
+            self._dirty.clear()
+            self.flush()
+            if stopping:
+                return
+    
+    def close(self):
+        self._stop_flusher.set()
+        self._dirty.set()
+        if self._flusher.is_alive() and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        super().close()
+
+
+class CachedTimeFormatter(logging.Formatter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._time_cache = (None, None, "")
+    
+    def formatTime(self, record, datefmt=None):
+        if not datefmt:
+            return super().formatTime(record, datefmt)
+        
+        second = int(record.created)
+        cached_second, cached_datefmt, cached_str = self._time_cache
+        if second == cached_second and datefmt == cached_datefmt:
+            return cached_str
+        
+        formatted = time.strftime(datefmt, self.converter(second))
+        self._time_cache = (second, datefmt, formatted)
+        return formatted
+
+
+class ConsoleFormatter(CachedTimeFormatter):
+    def format(self, record):
+        icon = getattr(record, 'icon', None)
+        record.icon_prefix = f"{icon} " if icon else ""
+        return super().format(record)
+
+
+class LeanFileFormatter(logging.Formatter):
+    def __init__(self, fmt='%(created).0f|%(levelname).1s|%(message)s', **kwargs):
+        super().__init__(fmt, **kwargs)
+
+
+_FILE_LISTENERS = {}
+
+
+def _queue_handler_for(log_file):
+    path = os.path.abspath(log_file)
+    if path in _FILE_LISTENERS:
+        return _FILE_LISTENERS[path]
     
-    formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s',
+    formatter = ConsoleFormatter(
+        '%(asctime)s - %(levelname)s - %(icon_prefix)s%(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(level)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    file_handler = BufferedFileHandler(path, encoding='utf-8')
+    file_handler.setFormatter(LeanFileFormatter())
     
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    
+    log_queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(file_handler.close)
+    atexit.register(listener.stop)
+    
+    _FILE_LISTENERS[path] = (queue_handler, listener)
+    return queue_handler, listener
+
+
+def setup_logger(name="scraper_caixa", log_file="scraper_caixa.log", level=logging.INFO):
+    logger = logging.getLogger(name)
+ 
+    if logger.handlers:
+        return logger
+    
+    logger.setLevel(level)
+    
+    queue_handler, listener = _queue_handler_for(log_file)
+    logger.addHandler(queue_handler)
+    logger._listener = listener
     
     return logger
 
 
+_short_repr = reprlib.Repr()
+_short_repr.maxstring = 50
+_short_repr.maxother = 50
+
+
+_CONTAINERS = (list, tuple, dict, set, frozenset)
+
+
+def _tag_open(tag):
+    attrs = ''.join(
+        f' {k}="{" ".join(v) if isinstance(v, list) else v}"' for k, v in tag.attrs.items()
+    )
+    return f"<{tag.name}{attrs}>"
+
+
+def _short(value, limit=50):
+    if isinstance(value, str):
+        return value[:limit]
+    if isinstance(value, _CONTAINERS):
+        return _short_repr.repr(value)[:limit]
+    if isinstance(getattr(value, 'name', None), str) and isinstance(getattr(value, 'attrs', None), dict):
+        return _tag_open(value)[:limit]
+    return str(value)[:limit]
+
+
+_RESULT_FORMATTERS = {
+    list: lambda r: f" - Retornou {len(r)} itens",
+    dict: lambda r: f" - Retornou {len(r)} itens",
+    bool: lambda r: f" - Status: {'✓ Sucesso' if r else '✗ Falha'}",
+}
+
+
 def log_method(func):
+    method_name = func.__name__
+    monotonic = time.monotonic
+    default_logger = logging.getLogger('scraper_caixa')
+    
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        logger = getattr(self, 'logger', logging.getLogger('scraper_caixa'))
-        
-        method_name = func.__name__
-        class_name = self.__class__.__name__
+        logger = getattr(self, 'logger', default_logger)
+        info_on = logger.isEnabledFor(logging.INFO)
+        class_name = type(self).__name__
         
-        if args or kwargs:
-            params = []
-            if args:
-                params.extend([str(arg)[:50] for arg in args])
-            if kwargs:
-                params.extend([f"{k}={str(v)[:50]}" for k, v in kwargs.items()])
-            params_str = f" com parâmetros: {', '.join(params)}" if params else ""
-        else:
-            params_str = ""
-            
-        logger.info(f"🔄 Iniciando {class_name}.{method_name}{params_str}")
+        if logger.isEnabledFor(logging.DEBUG):
+            if args or kwargs:
+                params = []
+                if args:
+                    params.extend([_short(arg) for arg in args])
+                if kwargs:
+                    params.extend([f"{k}={_short(v)}" for k, v in kwargs.items()])
+                params_str = f" com parâmetros: {', '.join(params)}" if params else ""
+            else:
+                params_str = ""
+                
+            logger.debug(
+                "Iniciando %s.%s%s", class_name, method_name, params_str, extra={'icon': '🔄'}
+            )
         
+        start_time = monotonic()
         try:
-            
-            start_time = time.time()
             result = func(self, *args, **kwargs)
-            duration = time.time() - start_time
+        except Exception as e:
+            logger.exception(
+                "Erro em %s.%s após %.2fs: %s", class_name, method_name, monotonic() - start_time, e,
+                extra={'icon': '❌'},
+            )
+            raise
+        
+        if info_on:
+            duration = monotonic() - start_time
             
-            if result is not None:
-                if isinstance(result, (list, dict)):
-                    result_info = f" - Retornou {len(result)} itens" if hasattr(result, '__len__') else ""
-                elif isinstance(result, bool):
-                    result_info = f" - Status: {'✓ Sucesso' if result else '✗ Falha'}"
-                else:
-                    result_info = f" - Resultado: {str(result)[:50]}"
+            result_fmt = _RESULT_FORMATTERS.get(type(result))
+            if result_fmt:
+                result_info = result_fmt(result)
+            elif result is not None:
+                result_info = f" - Resultado: {_short(result)}"
             else:
                 result_info = ""
                 
-            logger.info(f"✅ Concluído {class_name}.{method_name} em {duration:.2f}s{result_info}")
-            return result
-            
-        except Exception as e:
-            duration = time.time() - start_time
-            logger.error(f"❌ Erro em {class_name}.{method_name} após {duration:.2f}s: {e}")
-            raise
+            logger.info(
+                "Concluído %s.%s em %.2fs%s", class_name, method_name, duration, result_info,
+                extra={'icon': '✅'},
+            )
+        return result
             
     return wrapper
 
@@ -81,29 +226,40 @@ def log_method(func):
 def log_progress(current, total, item_name="item"):
     logger = logging.getLogger('scraper_caixa')
     percentage = (current / total) * 100 if total > 0 else 0
-    logger.info(f"📈 Progresso: {current}/{total} {item_name}s ({percentage:.1f}%)")
+    logger.info(
+        "Progresso: %d/%d %ss (%.1f%%)", current, total, item_name, percentage, extra={'icon': '📈'}
+    )
 
 
 def log_summary(data, title="Resumo"):
     logger = logging.getLogger('scraper_caixa')
-    logger.info(f"📊 {title}:")
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("%s:", title, extra={'icon': '📊'})
     for key, value in data.items():
-        logger.info(f"   {key}: {value}")
+        logger.info("   %s: %s", key, value)
+
+
+_SEP = "=" * 50
 
 
 def log_section(title):
     logger = logging.getLogger('scraper_caixa')
-    separator = "=" * 50
-    logger.info(f"\n{separator}")
-    logger.info(f"{title}")
-    logger.info(separator)
+    logger.info("\n%s", _SEP)
+    logger.info("%s", title)
+    logger.info("%s", _SEP)
+
+
+_verbose_on = False
 
 
 def configure_verbose_logging():
+    global _verbose_on
+    if _verbose_on:
+        return
+    
     logger = logging.getLogger('scraper_caixa')
     logger.setLevel(logging.DEBUG)
+    _verbose_on = True
     
-    for handler in logger.handlers:
-        handler.setLevel(logging.DEBUG)
-    
-    logger.debug("🔍 Logging verbose ativado")
+    logger.debug("Logging verbose ativado", extra={'icon': '🔍'})
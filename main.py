@@ -1,15 +1,6 @@
 import argparse
-from logger_config import setup_logger
-from script import CaixaScraper
 
-logger = setup_logger(name="main", log_file="scraper_caixa.log")
-
-
-def parse_arguments():
-    parser = argparse.ArgumentParser(
-        description='Scraper de Imóveis CAIXA - Extrai imóveis por estado e cidade',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+EPILOG = """
 Exemplos de uso:
   python main.py                             
   python main.py --estado RJ --cidade "RIO DE JANEIRO"
@@ -17,6 +8,13 @@ Exemplos de uso:
   python main.py --list-cities -e AM         
   python main.py --help                      
         """
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='Scraper de Imóveis CAIXA - Extrai imóveis por estado e cidade',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=EPILOG
     )
     
     parser.add_argument(
@@ -49,6 +47,8 @@ Exemplos de uso:
 def main():
     args = parse_arguments()
     
+    from script import CaixaScraper
+    
     if args.verbose:
         from logger_config import configure_verbose_logging
         configure_verbose_logging()
@@ -75,7 +75,9 @@ def main():
     print("URL: https://venda-imoveis.caixa.gov.br/sistema/busca-imovel.asp?sltTipoBusca=imoveis")
     print()
     
-    logger.info(f"=== INICIANDO SCRAPER CAIXA - {args.estado}/{args.cidade} ===")
+    from logger_config import setup_logger
+    logger = setup_logger(name="main", log_file="scraper_caixa.log")
+    logger.info("=== INICIANDO SCRAPER CAIXA - %s/%s ===", args.estado, args.cidade)
     
     scraper = CaixaScraper(estado=args.estado, cidade=args.cidade)
     
@@ -100,7 +102,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("Execução interrompida pelo usuário")
     except Exception as e:
-        logger.error(f"Erro durante execução: {e}")
+        logger.error("Erro durante execução: %s", e)
         print(f"Erro: {e}")
         raise
 
@@ -1,60 +1,217 @@
 import re
 import logging
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from bs4 import BeautifulSoup, Tag
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+except ImportError:
+    By = EC = WebDriverWait = None
 
 logger = logging.getLogger(__name__)
 
 
+_RE_NUMERO_ITEM = re.compile(r'número do item:\s*(\d+)', re.IGNORECASE)
+_RE_CODIGO = re.compile(r'número do imóvel:\s*([0-9\-]+)', re.IGNORECASE)
+_RE_AREA = re.compile(r'(\d+,?\d*)\s*m2')
+_RE_QUARTOS = re.compile(r'(\d+)\s*quarto')
+
+_RE_ENDERECO_FALLBACKS = (
+    
+    re.compile(r'Número do imóvel:\s*[0-9\-]+\s*(.+?)(?:\s*$|despesas)', re.IGNORECASE),
+    
+    re.compile(r'((?:RUA|AVENIDA|AV|ALAMEDA|TRAVESSA|PRAÇA)[^<\n]+?)(?:\s*<|\s*despesas)', re.IGNORECASE),
+    
+    re.compile(r'número do item:\s*\d+[^<\n]*?([^<\n]+?)(?:\s*despesas|$)', re.IGNORECASE),
+)
+
+_RE_ENDERECO_CANDIDATOS = (
+    
+    re.compile(r'((?:RUA|AVENIDA|AV|ALAMEDA|TRAVESSA|PRAÇA)\s+[^,]+,\s*N\.\s*[^,]+(?:,\s*[^,]+)*)', re.IGNORECASE),
+    
+    re.compile(r'((?:RUA|AVENIDA|AV|ALAMEDA|TRAVESSA|PRAÇA)[^,]+(?:,[^,]+)*?)(?:,\s*,|$)', re.IGNORECASE),
+    
+    re.compile(r'((?:RUA|AVENIDA|AV|ALAMEDA|TRAVESSA|PRAÇA)[^$]+)', re.IGNORECASE),
+)
+_RE_ENDERECO_LIXO = re.compile(
+    r'avaliação|valor.*venda|desconto|apartamento.*quarto|venda direta|número do imóvel', re.IGNORECASE
+)
+_RE_ENDERECO_SUB = re.compile(r'((?:RUA|AVENIDA|AV|ALAMEDA|TRAVESSA|PRAÇA)[^,]+(?:,[^,]+){0,2})', re.IGNORECASE)
+_RE_PADROES_A_REMOVER = (
+    re.compile(r'avaliação:\s*R\$[^A-Z]*', re.IGNORECASE),
+    re.compile(r'Valor mínimo de venda:[^A-Z]*', re.IGNORECASE),
+    re.compile(r'desconto de[^A-Z]*', re.IGNORECASE),
+    re.compile(r'Apartamento\s*-\s*\d+\s*quarto\(s\)\s*-[^A-Z]*', re.IGNORECASE),
+    re.compile(r'Venda Direta Online[^A-Z]*', re.IGNORECASE),
+    re.compile(r'Número do imóvel:\s*[0-9\-]+\s*', re.IGNORECASE),
+)
+_RE_WS = re.compile(r'\s+')
+_RE_TRAIL_COMMAS = re.compile(r',\s*,\s*$')
+_RE_LONG_CUT = re.compile(r'^(.{50,120}),\s*,')
+
+_RE_BAIRROS_SPLIT = re.compile(r'[\n,;|]')
+_RE_FORM_INDICATOR = re.compile(r'(?:^|>)[^<>]*?Selecione[^<>\n]*modalidade[^<>\n]*venda', re.IGNORECASE)
+_RE_POSSIVEL_IMOVEL = re.compile(r'r\$|rua|apartamento')
+_RE_CELL_ENDERECO = re.compile(r'rua|av |avenida|alameda|travessa')
+_RE_CELL_QUARTOS = re.compile(r'quarto|dorm|qto')
+_RE_PROPERTY_ROW = re.compile(
+    r'r\$|real|reais|valor|preço'
+    r'|rua|av |avenida|alameda|travessa'
+    r'|m²|m2|metro'
+    r'|apartamento|casa|imovel|imóvel'
+    r'|dorm|quarto|qto'
+)
+
+_TRIE_FIM = ''
+
+_PREFIXOS_BAIRRO = ('VILA ', 'CIDADE ', 'JARDIM ', 'PARQUE ', 'CONJUNTO ')
+
+_PREFIXOS_TITULO_INVALIDO = ('tempo restante', 'número do item')
+_PREFIXOS_NAO_TITULO = _PREFIXOS_TITULO_INVALIDO + ('despesas',)
+
+_JS_TEXTO_BAIRROS = "return arguments[0].innerText || '';"
+
+
+def _lexbor_tree(html_content):
+    tree = LexborHTMLParser(html_content)
+    tree.strip_tags(['script', 'style'])
+    return tree
+
+
+def _find_all(element, tag_name):
+    if isinstance(element, Tag):
+        return element.find_all(tag_name)
+    return element.css(tag_name)
+
+
+def _get_text(element, strip=False):
+    if isinstance(element, Tag):
+        return element.get_text(strip=strip)
+    return element.text(strip=strip)
+
+
 class CaixaPropertyParser:
     def __init__(self, bairros_disponiveis=None):
-        self.bairros_disponiveis = bairros_disponiveis or []
+        self.update_bairros_disponiveis(bairros_disponiveis)
     
     def update_bairros_disponiveis(self, bairros_list):
         self.bairros_disponiveis = bairros_list or []
+        bairros_normalizados = dict.fromkeys(
+            b.strip().upper() for b in self.bairros_disponiveis if b and b.strip()
+        )
+        self._bairros_ordenados = tuple(sorted(bairros_normalizados, key=len, reverse=True))
+        self._automaton = None
+        self._trie = None
+        self._indices_prontos = False
+        self._detect_cached = lru_cache(maxsize=8192)(self._detect_bairro)
+    
+    def _preparar_indices(self):
+        self._automaton = self._build_automaton(self._bairros_ordenados)
+        if self._automaton is None:
+            self._trie = self._build_trie(self._bairros_ordenados)
+        self._indices_prontos = True
+    
+    def _build_automaton(self, bairros_ordenados):
+        if ahocorasick is None or not bairros_ordenados:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for rank, bairro in enumerate(bairros_ordenados):
+            automaton.add_word(bairro, (rank, bairro))
+        automaton.make_automaton()
+        return automaton
+    
+    def _build_trie(self, bairros_ordenados):
+        trie = {}
+        for rank, bairro in enumerate(bairros_ordenados):
+            node = trie
+            for char in bairro:
+                node = node.setdefault(char, {})
+            node[_TRIE_FIM] = (rank, bairro)
+        return trie
+    
+    def _find_bairro_na_trie(self, endereco_upper):
+        trie = self._trie
+        best = None
+        size = len(endereco_upper)
+        for start in range(size):
+            node = trie
+            for pos in range(start, size):
+                node = node.get(endereco_upper[pos])
+                if node is None:
+                    break
+                match = node.get(_TRIE_FIM)
+                if match and (best is None or match < best):
+                    best = match
+        return best[1] if best else None
+    
+    def _find_bairro_conhecido(self, endereco_upper):
+        if not self._indices_prontos:
+            self._preparar_indices()
+        
+        if self._automaton is not None:
+            best = min((match for _, match in self._automaton.iter(endereco_upper)), default=None)
+            return best[1] if best else None
+        
+        if self._trie:
+            return self._find_bairro_na_trie(endereco_upper)
+        return None
     
     def detect_bairro_from_endereco(self, endereco):
         if not endereco:
             logger.debug("Endereço está vazio")
             return ""
         
-        endereco_upper = endereco.upper()
-        logger.debug(f"Procurando bairro em: {endereco_upper}")
+        return self._detect_cached(endereco.upper())
+    
+    def _detect_bairro(self, endereco_upper):
+        logger.debug("Procurando bairro em: %s", endereco_upper)
         
         
-        if not self.bairros_disponiveis:
+        if not self._bairros_ordenados:
             logger.debug("Lista de bairros está vazia, usando detecção por padrões")
             return self.detect_bairro_by_patterns(endereco_upper)
         
-        logger.debug(f"Total de bairros disponíveis: {len(self.bairros_disponiveis)}")
-        
+        logger.debug("Total de bairros disponíveis: %d", len(self._bairros_ordenados))
         
-        bairros_ordenados = sorted(self.bairros_disponiveis, key=len, reverse=True)
         
-        for bairro in bairros_ordenados:
-            if bairro in endereco_upper:
-                logger.debug(f"Bairro '{bairro}' encontrado no endereço: {endereco[:50]}...")
-                return bairro
+        bairro = self._find_bairro_conhecido(endereco_upper)
+        if bairro:
+            logger.debug("Bairro '%s' encontrado no endereço: %.50s...", bairro, endereco_upper)
+            return bairro
         
         
         bairro_pattern = self.detect_bairro_by_patterns(endereco_upper)
         if bairro_pattern:
-            logger.debug(f"Bairro detectado por padrão: {bairro_pattern}")
+            logger.debug("Bairro detectado por padrão: %s", bairro_pattern)
             return bairro_pattern
         
-        logger.debug(f"Nenhum bairro encontrado no endereço: {endereco[:50]}...")
+        logger.debug("Nenhum bairro encontrado no endereço: %.50s...", endereco_upper)
         return ""
     
     def detect_bairro_by_patterns(self, endereco_upper):        
-        parts = endereco_upper.split(',')
-        if len(parts) >= 2:
-            last_part = parts[-1].strip()
+        _, sep, last_part = endereco_upper.rpartition(',')
+        if sep:
+            last_part = last_part.strip()
             
             if len(last_part) > 4 and last_part.isalpha():
                 return last_part
         
         
         
-        parts_hyphen = endereco_upper.split(' - ')
+        parts_hyphen = endereco_upper.rsplit(' - ', 2)
         if len(parts_hyphen) >= 2:
             
             potential_bairro = parts_hyphen[-2].strip()
@@ -62,12 +219,11 @@ class CaixaPropertyParser:
                 return potential_bairro
         
         
-        prefixos_bairro = ['VILA ', 'CIDADE ', 'JARDIM ', 'PARQUE ', 'CONJUNTO ']
-        for prefixo in prefixos_bairro:
-            if prefixo in endereco_upper:
+        for prefixo in _PREFIXOS_BAIRRO:
+            start_pos = endereco_upper.find(prefixo)
+            if start_pos != -1:
                 
-                start_pos = endereco_upper.find(prefixo)
-                rest_text = endereco_upper[start_pos:].split(',')[0].split(' - ')[0]
+                rest_text = endereco_upper[start_pos:].partition(',')[0].partition(' - ')[0]
                 if len(rest_text) > len(prefixo) + 3:  
                     return rest_text.strip()
         
@@ -88,27 +244,28 @@ class CaixaPropertyParser:
         
         
         for i, cell in enumerate(row_cells):
-            cell_lower = cell.lower().strip()
+            cell_strip = cell.strip()
+            cell_lower = cell_strip.lower()
             
             
-            if i == 0 and cell.strip():
-                property_data['codigo'] = cell.strip()
+            if i == 0 and cell_strip:
+                property_data['codigo'] = cell_strip
             
             
             if 'r$' in cell_lower:
-                property_data['valor'] = cell.strip()
+                property_data['valor'] = cell_strip
             
             
             if 'm²' in cell_lower or 'm2' in cell_lower:
-                property_data['area'] = cell.strip()
+                property_data['area'] = cell_strip
             
             
-            if any(word in cell_lower for word in ['rua', 'av ', 'avenida', 'alameda', 'travessa']):
-                property_data['endereco'] = cell.strip()
+            if _RE_CELL_ENDERECO.search(cell_lower):
+                property_data['endereco'] = cell_strip
             
             
-            if any(word in cell_lower for word in ['quarto', 'dorm', 'qto']):
-                property_data['quartos'] = cell.strip()
+            if _RE_CELL_QUARTOS.search(cell_lower):
+                property_data['quartos'] = cell_strip
                 
         return property_data
     
@@ -128,37 +285,31 @@ class CaixaPropertyParser:
             }
             
             
-            title_element = None
-            strong_elements = item_element.find_all('strong')
+            title_text = None
+            strong_elements = _find_all(item_element, 'strong')
             
             
             for strong in strong_elements:
-                text = strong.get_text(strip=True)
+                text = _get_text(strong, strip=True)
+                if not text or len(text) <= 10:
+                    continue
                 
-                if (text and 
-                    not text.lower().startswith('tempo restante') and
-                    not text.lower().startswith('número do item') and
-                    not text.lower().startswith('despesas') and
-                    len(text) > 10):  
-                    title_element = strong
+                if not text.lower().startswith(_PREFIXOS_NAO_TITULO):  
+                    title_text = text
                     break
             
             
-            if not title_element and strong_elements:
-                title_element = strong_elements[0]
+            if title_text is None and strong_elements:
+                title_text = _get_text(strong_elements[0], strip=True)
             
-            if title_element:
-                title_text = title_element.get_text(strip=True)
-                
-                
-                if (title_text.lower().startswith('tempo restante') or 
-                    title_text.lower().startswith('número do item')):
+            if title_text is not None:
+                if title_text.lower().startswith(_PREFIXOS_TITULO_INVALIDO):
                     
                     
                     
-                    link_elements = item_element.find_all('a')
+                    link_elements = _find_all(item_element, 'a')
                     for link in link_elements:
-                        link_text = link.get_text(strip=True)
+                        link_text = _get_text(link, strip=True)
                         if (link_text and len(link_text) > 10 and 
                             not link_text.lower().startswith('tempo restante')):
                             title_text = link_text
@@ -179,111 +330,95 @@ class CaixaPropertyParser:
                     property_data['titulo'] = title_text
             
             
-            all_text = item_element.get_text()
-            logger.debug(f"Texto completo do item: {all_text[:200]}...")
+            all_text = _get_text(item_element)
+            logger.debug("Texto completo do item: %.200s...", all_text)
+            
             
+            texto_lower = all_text.lower()
+            lines = all_text.split('\n')
             
             self._extract_numero_item(all_text, property_data)
             self._extract_codigo_imovel(all_text, property_data)
-            self._extract_endereco(all_text, property_data)
-            self._extract_technical_info(all_text, property_data)
+            self._extract_endereco(all_text, texto_lower, lines, property_data)
+            self._extract_technical_info(texto_lower, lines, property_data)
             
             
             if property_data['endereco']:
                 bairro_detectado = self.detect_bairro_from_endereco(property_data['endereco'])
                 if bairro_detectado:
                     property_data['bairro'] = bairro_detectado
-                    logger.debug(f"Bairro detectado: {bairro_detectado}")
+                    logger.debug("Bairro detectado: %s", bairro_detectado)
             
             return property_data if property_data['titulo'] else None
             
         except Exception as e:
-            logger.error(f"Erro ao extrair imóvel: {e}")
+            logger.error("Erro ao extrair imóvel: %s", e)
             return None
     
     def _extract_numero_item(self, all_text, property_data):
-        numero_item_match = re.search(r'número do item:\s*(\d+)', all_text, re.IGNORECASE)
+        numero_item_match = _RE_NUMERO_ITEM.search(all_text)
         if numero_item_match:
             property_data['numero_item'] = numero_item_match.group(1)
-            logger.debug(f"Número do item encontrado: {property_data['numero_item']}")
+            logger.debug("Número do item encontrado: %s", property_data['numero_item'])
     
     def _extract_codigo_imovel(self, all_text, property_data):
-        codigo_match = re.search(r'número do imóvel:\s*([0-9\-]+)', all_text, re.IGNORECASE)
+        codigo_match = _RE_CODIGO.search(all_text)
         if codigo_match:
             property_data['codigo'] = codigo_match.group(1).strip()
-            logger.debug(f"Código encontrado: {property_data['codigo']}")
+            logger.debug("Código encontrado: %s", property_data['codigo'])
     
-    def _extract_endereco(self, all_text, property_data):
-        lines = all_text.split('\n')
+    def _extract_endereco(self, all_text, texto_lower, lines, property_data):
         endereco_encontrado = False
         
         
-        for i, line in enumerate(lines):
-            line_clean = line.strip()
-            if 'número do item:' in line_clean.lower():
-                
-                for j in range(i + 1, len(lines)):
-                    next_line = lines[j].strip()
-                    if next_line and not next_line.lower().startswith('despesas'):
-                        
-                        endereco_limpo = self._clean_endereco(next_line)
-                        if endereco_limpo:
-                            property_data['endereco'] = endereco_limpo
-                            logger.debug(f"Endereço encontrado: {endereco_limpo}")
-                            endereco_encontrado = True
-                            break
-                break
+        pos_item = texto_lower.find('número do item:')
+        if pos_item != -1:
+            
+            linha_item = texto_lower.count('\n', 0, pos_item)
+            for j in range(linha_item + 1, len(lines)):
+                next_line = lines[j].strip()
+                if next_line and not next_line.lower().startswith('despesas'):
+                    
+                    endereco_limpo = self._clean_endereco(next_line)
+                    if endereco_limpo:
+                        property_data['endereco'] = endereco_limpo
+                        logger.debug("Endereço encontrado: %s", endereco_limpo)
+                        endereco_encontrado = True
+                        break
         
         
         if not endereco_encontrado:
-            endereco_patterns = [
-                
-                r'Número do imóvel:\s*[0-9\-]+\s*(.+?)(?:\s*$|despesas)',
-                
-                r'((?:RUA|AVENIDA|AV|ALAMEDA|TRAVESSA|PRAÇA)[^<\n]+?)(?:\s*<|\s*despesas)',
-                
-                r'número do item:\s*\d+[^<\n]*?([^<\n]+?)(?:\s*despesas|$)',
-            ]
-            
-            for pattern in endereco_patterns:
-                endereco_match = re.search(pattern, all_text, re.IGNORECASE)
+            for pattern in _RE_ENDERECO_FALLBACKS:
+                endereco_match = pattern.search(all_text)
                 if endereco_match:
                     endereco_bruto = endereco_match.group(1).strip()
                     endereco_limpo = self._clean_endereco(endereco_bruto)
                     if endereco_limpo and len(endereco_limpo) > 10:
                         property_data['endereco'] = endereco_limpo
-                        logger.debug(f"Endereço via regex: {endereco_limpo}")
+                        logger.debug("Endereço via regex: %s", endereco_limpo)
                         endereco_encontrado = True
                         break
     
-    def _clean_endereco(self, endereco_bruto):
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _clean_endereco(endereco_bruto):
         if not endereco_bruto:
             return ""
         
         endereco = endereco_bruto.strip()
         
-        
-        endereco_patterns = [
-            
-            r'((?:RUA|AVENIDA|AV|ALAMEDA|TRAVESSA|PRAÇA)\s+[^,]+,\s*N\.\s*[^,]+(?:,\s*[^,]+)*)',
-            
-            r'((?:RUA|AVENIDA|AV|ALAMEDA|TRAVESSA|PRAÇA)[^,]+(?:,[^,]+)*?)(?:,\s*,|$)',
-            
-            r'((?:RUA|AVENIDA|AV|ALAMEDA|TRAVESSA|PRAÇA)[^$]+)',
-        ]
-        
         endereco_encontrado = None
-        for pattern in endereco_patterns:
-            match = re.search(pattern, endereco, re.IGNORECASE)
+        for pattern in _RE_ENDERECO_CANDIDATOS:
+            match = pattern.search(endereco)
             if match:
                 candidato = match.group(1).strip()
                 
-                if not re.search(r'avaliação|valor.*venda|desconto|apartamento.*quarto|venda direta|número do imóvel', candidato, re.IGNORECASE):
+                if not _RE_ENDERECO_LIXO.search(candidato):
                     endereco_encontrado = candidato
                     break
                 elif len(candidato) > 20:  
                     
-                    sub_match = re.search(r'((?:RUA|AVENIDA|AV|ALAMEDA|TRAVESSA|PRAÇA)[^,]+(?:,[^,]+){0,2})', candidato, re.IGNORECASE)
+                    sub_match = _RE_ENDERECO_SUB.search(candidato)
                     if sub_match:
                         endereco_encontrado = sub_match.group(1).strip()
                         break
@@ -293,51 +428,40 @@ class CaixaPropertyParser:
         else:
             
             
-            padroes_a_remover = [
-                r'avaliação:\s*R\$[^A-Z]*',
-                r'Valor mínimo de venda:[^A-Z]*',
-                r'desconto de[^A-Z]*',
-                r'Apartamento\s*-\s*\d+\s*quarto\(s\)\s*-[^A-Z]*',
-                r'Venda Direta Online[^A-Z]*',
-                r'Número do imóvel:\s*[0-9\-]+\s*',
-            ]
-            
-            for padrao in padroes_a_remover:
-                endereco = re.sub(padrao, '', endereco, flags=re.IGNORECASE)
+            for padrao in _RE_PADROES_A_REMOVER:
+                endereco = padrao.sub('', endereco)
         
         
-        endereco = re.sub(r'\s+', ' ', endereco).strip()
+        endereco = _RE_WS.sub(' ', endereco).strip()
         
         
-        endereco = re.sub(r',\s*,\s*$', '', endereco).strip()
+        endereco = _RE_TRAIL_COMMAS.sub('', endereco).strip()
         
         
         if len(endereco) > 150:
             
-            match = re.search(r'^(.{50,120}),\s*,', endereco)
+            match = _RE_LONG_CUT.search(endereco)
             if match:
                 endereco = match.group(1).strip()
         
         return endereco
     
-    def _extract_technical_info(self, all_text, property_data):
-        lines = all_text.split('\n')
-        
-        for line in lines:
-            line_lower = line.lower()
+    def _extract_technical_info(self, texto_lower, lines, property_data):
+        for i, line_lower in enumerate(texto_lower.split('\n')):
 
             if 'apartamento' in line_lower and 'm2' in line_lower:
                 property_data['tipo_imovel'] = 'Apartamento'
-                area_match = re.search(r'(\d+,?\d*)\s*m2', line)
+                area_match = _RE_AREA.search(lines[i])
                 if area_match:
                     property_data['area'] = area_match.group(1) + ' m²'
             
             elif 'casa' in line_lower:
                 property_data['tipo_imovel'] = 'Casa'
             
-            quartos_match = re.search(r'(\d+)\s*quarto', line_lower)
-            if quartos_match:
-                property_data['quartos'] = quartos_match.group(1) + ' quartos'
+            if 'quarto' in line_lower:
+                quartos_match = _RE_QUARTOS.search(line_lower)
+                if quartos_match:
+                    property_data['quartos'] = quartos_match.group(1) + ' quartos'
             
             if 'leilão' in line_lower:
                 property_data['modalidade'] = 'Leilão'
@@ -351,52 +475,30 @@ class CaixaHtmlExtractor:
         self.parser = parser or CaixaPropertyParser()
     
     def extract_bairros_from_html(self, driver):
+        if By is None:
+            logger.warning("Selenium não está instalado; não é possível extrair bairros do HTML")
+            return []
+        
         try:
-            
-            import time
-            time.sleep(2)
-            
-            from selenium.webdriver.common.by import By
-            
-            
-            listabairros_element = driver.find_element(By.ID, "listabairros")
-            
-            
-            bairro_elements = []
-            
-            
-            try:
-                elements = listabairros_element.find_elements(By.XPATH, ".//a | .//div | .//span | .//li")
-                bairro_elements.extend(elements)
-            except:
-                pass
+            listabairros_element = WebDriverWait(driver, 5).until(
+                EC.presence_of_element_located((By.ID, "listabairros"))
+            )
             
             
             try:
-                elements = listabairros_element.find_elements(By.XPATH, ".//*[text()]")
-                bairro_elements.extend(elements)
-            except:
-                pass
+                bairros_text = driver.execute_script(_JS_TEXTO_BAIRROS, listabairros_element) or ''
+            except Exception:
+                bairros_text = listabairros_element.text
             
             
-            if not bairro_elements:
-                bairros_text = listabairros_element.text
-                
-                bairros_list = re.split(r'[\n,;|]', bairros_text)
-                bairros = [b.strip().upper() for b in bairros_list if b.strip() and len(b.strip()) > 2]
-            else:
-                bairros = []
-                for element in bairro_elements:
-                    bairro_text = element.text.strip()
-                    if bairro_text and len(bairro_text) > 2:  
-                        bairros.append(bairro_text.upper())  
+            bairros = {b.upper() for b in map(str.strip, _RE_BAIRROS_SPLIT.split(bairros_text)) if len(b) > 2}
             
             
-            bairros_disponiveis = sorted(list(set(bairros)))
+            bairros_disponiveis = sorted(bairros)
             
-            logger.info(f"Extraídos {len(bairros_disponiveis)} bairros disponíveis")
+            logger.info("Extraídos %d bairros disponíveis", len(bairros_disponiveis))
             if bairros_disponiveis:
-                logger.debug(f"Primeiros 10 bairros: {bairros_disponiveis[:10]}")
+                logger.debug("Primeiros 10 bairros: %s", bairros_disponiveis[:10])
             else:
                 logger.warning("Nenhum bairro foi extraído")
             
@@ -406,47 +508,73 @@ class CaixaHtmlExtractor:
             return bairros_disponiveis
             
         except Exception as e:
-            logger.warning(f"Não foi possível extrair bairros: {e}")
+            logger.warning("Não foi possível extrair bairros: %s", e)
             
             try:
                 
-                possible_elements = driver.find_elements(By.XPATH, "//div[contains(@id, 'bairro') or contains(@class, 'bairro')]")
-                for elem in possible_elements:
-                    logger.debug(f"Elemento encontrado: {elem.get_attribute('id')} - {elem.text[:100]}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    possible_elements = driver.find_elements(By.XPATH, "//div[contains(@id, 'bairro') or contains(@class, 'bairro')]")
+                    for elem in possible_elements:
+                        logger.debug("Elemento encontrado: %s - %.100s", elem.get_attribute('id'), elem.text)
             except:
                 pass
             return []
     
-    def extract_imoveis_da_pag(self, html_content):
-        soup = BeautifulSoup(html_content, 'html.parser')
+    def _find_property_items(self, html_content):
+        if LexborHTMLParser is not None:
+            results_section = _lexbor_tree(html_content).css_first('div#listaimoveispaginacao')
+            if results_section is None:
+                return None, None
+            return results_section.css('li.group-block-item'), None
+        
+        soup = BeautifulSoup(html_content, 'lxml')
+        results_section = soup.find('div', id='listaimoveispaginacao')
+        if not results_section:
+            return None, soup
+        return results_section.find_all('li', class_='group-block-item'), soup
+    
+    def _extract_items(self, property_items):
         imoveis = []
+        logger.info("Encontrados %d itens de imóvel", len(property_items))
         
+        for i, item in enumerate(property_items):
+            property_data = self.parser.extract_property_from_caixa_item(item)
+            if property_data:
+                imoveis.append(property_data)
+                logger.info("Imóvel %d: %.50s...", i + 1, property_data['titulo'])
+        return imoveis
+    
+    def extract_imoveis_do_fragmento(self, fragmento):
+        if LexborHTMLParser is not None:
+            property_items = _lexbor_tree(fragmento).css('li.group-block-item')
+        else:
+            property_items = BeautifulSoup(fragmento, 'lxml').find_all('li', class_='group-block-item')
         
-        results_section = soup.find('div', id='listaimoveispaginacao')
-        if results_section:
+        imoveis = self._extract_items(property_items)
+        logger.info("Extraídos %d imóveis desta página", len(imoveis))
+        return imoveis
+    
+    def extract_imoveis_da_pag(self, html_content):
+        property_items, soup = self._find_property_items(html_content)
+        if property_items is not None:
             logger.info("✓ Página de resultados encontrada!")
             
             
-            property_items = results_section.find_all('li', class_='group-block-item')
-            logger.info(f"Encontrados {len(property_items)} itens de imóvel")
-            
-            for i, item in enumerate(property_items):
-                property_data = self.parser.extract_property_from_caixa_item(item)
-                if property_data:
-                    imoveis.append(property_data)
-                    logger.info(f"Imóvel {i+1}: {property_data['titulo'][:50]}...")
+            imoveis = self._extract_items(property_items)
         
         else:
             
-            form_indicators = soup.find_all(string=re.compile(r'Selecione.*modalidade.*venda', re.IGNORECASE))
-            if form_indicators:
+            if _RE_FORM_INDICATOR.search(html_content):
                 logger.warning("Ainda estamos na página do formulário")
                 return []
             
+            if soup is None:
+                soup = BeautifulSoup(html_content, 'lxml')
+            
             logger.warning("Estrutura de resultados não encontrada, tentando métodos alternativos...")
             imoveis = self._extract_from_fallback_methods(soup)
         
-        logger.info(f"Extraídos {len(imoveis)} imóveis desta página")
+        logger.info("Extraídos %d imóveis desta página", len(imoveis))
         return imoveis
     
     def _extract_from_fallback_methods(self, soup):
@@ -454,11 +582,11 @@ class CaixaHtmlExtractor:
         
         
         tables = soup.find_all('table')
-        logger.info(f"Encontradas {len(tables)} tabelas na página")
+        logger.info("Encontradas %d tabelas na página", len(tables))
         
         for i, table in enumerate(tables):
             rows = table.find_all('tr')
-            logger.info(f"Tabela {i+1}: {len(rows)} linhas")
+            logger.info("Tabela %d: %d linhas", i + 1, len(rows))
             
             
             for j, row in enumerate(rows):
@@ -469,18 +597,10 @@ class CaixaHtmlExtractor:
                     
                     
                     if j < 3:  
-                        logger.info(f"  Linha {j+1}: {cell_texts}")
-                    
+                        logger.info("  Linha %d: %s", j + 1, cell_texts)
                     
-                    has_property_indicators = any(keyword in row_text for keyword in [
-                        'r$', 'real', 'reais', 'valor', 'preço',
-                        'rua', 'av ', 'avenida', 'alameda', 'travessa',
-                        'm²', 'm2', 'metro',
-                        'apartamento', 'casa', 'imovel', 'imóvel',
-                        'dorm', 'quarto', 'qto'
-                    ])
                     
-                    if has_property_indicators and len(cell_texts) >= 3:
+                    if len(cell_texts) >= 3 and _RE_PROPERTY_ROW.search(row_text):
                         property_data = self.parser.parse_property_from_row(cell_texts)
                         imoveis.append(property_data)
         
@@ -492,7 +612,7 @@ class CaixaHtmlExtractor:
             divs = soup.find_all('div')
             for div in divs:
                 text = div.get_text(strip=True)
-                if len(text) > 50 and any(keyword in text.lower() for keyword in ['r$', 'rua', 'apartamento']):
-                    logger.info(f"Possível imóvel em div: {text[:100]}...")
+                if len(text) > 50 and _RE_POSSIVEL_IMOVEL.search(text.lower()):
+                    logger.info("Possível imóvel em div: %.100s...", text)
         
         return imoveis
@@ -1,19 +1,34 @@
+import csv
+import logging
 import time
 import json
 import re
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Tuple
-import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 from fake_useragent import UserAgent
 from datetime import datetime
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from ratelimit import limits, sleep_and_retry
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
 from logger_config import setup_logger, log_method
 from parser import CaixaPropertyParser, CaixaHtmlExtractor
 logger = setup_logger(name="scraper_caixa", log_file="scraper_caixa.log")
@@ -27,6 +42,10 @@ URL_BAIRROS = f"{SISTEMA}/carregaListaBairros.asp"
 URL_PESQUISA = f"{SISTEMA}/carregaPesquisaImoveis.asp"
 URL_LISTA = f"{SISTEMA}/carregaListaImoveis.asp"
 
+_RE_OPCAO_CIDADE = re.compile(r"<option value='([^']+)'>([^<]+)")
+_PREFIXO_IMOV = "hdnImov"
+_RE_ID_PAGINACAO = re.compile(r"^(?:hdnImov|hdnQtdPag$|hdnQtdRegistros$)")
+
 
 CODIGO_CIDADE_FALLBACK: Dict[Tuple[str, str], str] = {
     ("SP", "SAO PAULO"): "9859",
@@ -34,15 +53,25 @@ CODIGO_CIDADE_FALLBACK: Dict[Tuple[str, str], str] = {
     
 }
 
+
+@lru_cache(maxsize=None)
+def _user_agent() -> UserAgent:
+    return UserAgent()
+
+
 class CaixaScraper:
 
     def __init__(self, estado="SP", cidade="SAO PAULO"):
         self.base_url = BASE_URL
         self.search_url = BUSCA_URL
-        self.ua = UserAgent()
+        self.ua = _user_agent()
         self.delay_between_requests = 0.5  
+        self.max_workers = 4
         self.imoveis_scraped = []
         self.session = None
+        self._session_lock = threading.Lock()
+        self._cadencia_lock = threading.Lock()
+        self._proxima_pagina = 0.0
 
         
         self.logger = logger
@@ -58,10 +87,14 @@ class CaixaScraper:
             'estado': estado,
             'cidade': cidade
         }
+        self._slug = f"{estado.lower()}_{cidade.lower().replace(' ', '_')}"
 
-        logger.info(f"Scraper configurado para Estado: {estado}, Cidade: {cidade}")
+        logger.info("Scraper configurado para Estado: %s, Cidade: %s", estado, cidade)
 
     def list_available_cities(self, estado: str) -> List[str]:
+        return sorted(nome for nome, _ in self._opcoes_cidades(estado))
+
+    def _opcoes_cidades(self, estado: str) -> List[Tuple[str, str]]:
         self._init_session()
         payload = {
             "cmb_estado": estado,
@@ -77,55 +110,56 @@ class CaixaScraper:
             "strAceitaFinanciamento": "",
         }
         r = self._post(URL_CIDADES, payload)
-        html = r.text
-        
         
-        import re
-        option_pattern = r"<option value='([^']+)'>([^<]+)"
-        matches = re.findall(option_pattern, html)
-        
-        cities = []
-        for value, city_text in matches:
-            if value and city_text.strip() and city_text.strip().upper() != "SELECIONE":
-                normalized_city = self._norm(city_text.strip())
-                cities.append(normalized_city)
-        
-        return sorted(cities)
+        opcoes = []
+        for value, city_text in _RE_OPCAO_CIDADE.findall(r.text):
+            city_text = city_text.strip()
+            if value and city_text and city_text.upper() != "SELECIONE":
+                opcoes.append((self._norm(city_text), value))
+        return opcoes
 
     
     def _init_session(self):
         if self.session is None:
-            s = requests.Session()
-            ua = self.ua.random
-            s.headers.update({
-                "User-Agent": ua,
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-                "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-                "Connection": "keep-alive",
-                "Referer": self.search_url,
-                "Origin": BASE_URL,
-                "Upgrade-Insecure-Requests": "1",
-            })
-            
-            s.get(self.search_url, timeout=30)
-            self.session = s
-
-    def _refresh_session(self):
-        try:
-            if self.session:
-                self.session.close()
-        except Exception:
-            pass
-        self.session = None
+            self.session = self._nova_sessao()
+
+    def _nova_sessao(self) -> requests.Session:
+        s = requests.Session()
+        s.mount("https://", HTTPAdapter(pool_maxsize=max(self.max_workers, 10)))
+        ua = self.ua.random
+        s.headers.update({
+            "User-Agent": ua,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+            "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+            "Connection": "keep-alive",
+            "Referer": self.search_url,
+            "Origin": BASE_URL,
+            "Upgrade-Insecure-Requests": "1",
+        })
         
-        time.sleep(0.5 + random.random())
-        self._init_session()
+        s.get(self.search_url, timeout=30)
+        return s
+
+    def _refresh_session(self, antiga: requests.Session):
+        
+        with self._session_lock:
+            if self.session is not antiga:
+                return
+            time.sleep(0.5 + random.random())
+            self.session = self._nova_sessao()
+        # A sessão antiga não é fechada aqui: outros workers podem ter requisições
+        # em andamento nela. Suas conexões são liberadas quando a última referência cai.
 
-    def _is_captcha(self, text: str) -> bool:
-        if not text:
+    def _is_captcha(self, content: bytes) -> bool:
+        if not content:
             return False
-        t = text[:2048].lower()
-        return ("radware bot manager" in t) or ("captcha" in t and "radware" in t) or ("<title>radware" in t)
+        t = content[:2048].lower()
+        return (b"radware bot manager" in t) or (b"captcha" in t and b"radware" in t) or (b"<title>radware" in t)
+
+    def _aguardar_retry_after(self, resp: requests.Response):
+        valor = resp.headers.get("Retry-After", "").strip()
+        if valor.isdigit():
+            time.sleep(min(int(valor), 30))
 
     @sleep_and_retry
     @limits(calls=6, period=1)  
@@ -141,12 +175,16 @@ class CaixaScraper:
             "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
             "Accept": "*/*",
         }
-        resp = self.session.post(url, data=data, headers=headers, timeout=30)
+        session = self.session
+        resp = session.post(url, data=data, headers=headers, timeout=30)
         
-        if self._is_captcha(resp.text):
+        if self._is_captcha(resp.content):
             logger.warning("CAPTCHA detectado no POST. Renovando sessão e tentando novamente.")
-            self._refresh_session()
+            self._refresh_session(session)
             raise RequestException("captcha")
+        if resp.status_code == 429:
+            self._aguardar_retry_after(resp)
+            raise RequestException(f"{url} status {resp.status_code}")
         if resp.status_code >= 500:
             raise RequestException(f"{url} status {resp.status_code}")
         return resp
@@ -163,85 +201,63 @@ class CaixaScraper:
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
             "Referer": self.search_url,
         }
-        resp = self.session.get(url, params=params or {}, headers=headers, timeout=30)
-        if self._is_captcha(resp.text):
+        session = self.session
+        resp = session.get(url, params=params or {}, headers=headers, timeout=30)
+        if self._is_captcha(resp.content):
             logger.warning("CAPTCHA detectado no GET. Renovando sessão e tentando novamente.")
-            self._refresh_session()
+            self._refresh_session(session)
             raise RequestException("captcha")
+        if resp.status_code == 429:
+            self._aguardar_retry_after(resp)
+            raise RequestException(f"{url} status {resp.status_code}")
         if resp.status_code >= 500:
             raise RequestException(f"{url} status {resp.status_code}")
         return resp
 
     def _norm(self, s: str) -> str:
-        return re.sub(r"\s+", " ", (s or "").strip().upper())
+        return " ".join(s.upper().split()) if s else ""
 
     
     @log_method
     def _obter_codigo_cidade(self, estado: str, nome_cidade: str) -> str:
-        self._init_session()
-        payload = {
-            "cmb_estado": estado,
-            "cmb_cidade": "",
-            "cmb_tp_venda": "",
-            "cmb_tp_imovel": "",
-            "cmb_area_util": "",
-            "cmb_faixa_vlr": "",
-            "cmb_quartos": "",
-            "cmb_vg_garagem": "",
-            "strValorSimulador": "",
-            "strAceitaFGTS": "",
-            "strAceitaFinanciamento": "",
-        }
-        r = self._post(URL_CIDADES, payload)
-        html = r.text
-        
-        
-        
-        import re
+        opcoes = self._opcoes_cidades(estado)
         
         alvo = self._norm(nome_cidade)
         
+        available_cities = [nome for nome, _ in opcoes]
+        city_options = dict(opcoes)
         
-        option_pattern = r"<option value='([^']+)'>([^<]+)"
-        matches = re.findall(option_pattern, html)
-        
-        available_cities = []
-        city_options = {}
-        
-        for value, city_text in matches:
-            if value and city_text.strip() and city_text.strip().upper() != "SELECIONE":
-                normalized_city = self._norm(city_text.strip())
-                available_cities.append(normalized_city)
-                city_options[normalized_city] = value
-        
-        logger.info(f"Cidades disponíveis para {estado}: {available_cities}")
+        logger.info("Cidades disponíveis para %s: %s", estado, available_cities)
         
         
         if alvo in city_options:
-            logger.info(f"Encontrada correspondência exata: '{alvo}' -> código {city_options[alvo]}")
+            logger.info("Encontrada correspondência exata: '%s' -> código %s", alvo, city_options[alvo])
             return city_options[alvo]
         
         
+        reversa = None
         for city_name, city_code in city_options.items():
             if alvo in city_name:
-                logger.info(f"Encontrada correspondência parcial: '{city_name}' para '{alvo}' -> código {city_code}")
+                logger.info("Encontrada correspondência parcial: '%s' para '%s' -> código %s", city_name, alvo, city_code)
                 return city_code
+            if reversa is None and city_name in alvo:
+                reversa = (city_name, city_code)
         
         
-        for city_name, city_code in city_options.items():
-            if city_name in alvo:
-                logger.info(f"Encontrada correspondência reversa: '{city_name}' para '{alvo}' -> código {city_code}")
-                return city_code
+        if reversa is not None:
+            city_name, city_code = reversa
+            logger.info("Encontrada correspondência reversa: '%s' para '%s' -> código %s", city_name, alvo, city_code)
+            return city_code
         
         
         override = CODIGO_CIDADE_FALLBACK.get((estado, alvo))
         if override:
-            logger.info(f"Usando fallback de código de cidade para {estado}/{alvo}: {override}")
+            logger.info("Usando fallback de código de cidade para %s/%s: %s", estado, alvo, override)
             return override
         
         
-        logger.error(f"Cidade '{nome_cidade}' não encontrada para estado {estado}")
-        logger.error(f"Cidades disponíveis: {', '.join(available_cities)}")
+        logger.error("Cidade '%s' não encontrada para estado %s", nome_cidade, estado)
+        logger.error("Cidades disponíveis: %s", ', '.join(available_cities))
         raise ValueError(f"Cidade '{nome_cidade}' não encontrada para estado {estado}. Cidades disponíveis: {', '.join(available_cities)}")
 
     @log_method
@@ -262,17 +278,22 @@ class CaixaScraper:
             "strAceitaFinanciamento": "",
         }
         r = self._post(URL_BAIRROS, payload)
-        soup = BeautifulSoup(r.text, 'html.parser')
+        if LexborHTMLParser is not None:
+            tree = LexborHTMLParser(r.text)
+            tree.strip_tags(['script', 'style'])
+            textos = (lab.text(separator=" ") for lab in tree.css('label'))
+        else:
+            textos = (lab.get_text(" ") for lab in BeautifulSoup(r.text, 'lxml').find_all('label'))
         bairros = []
         
-        for lab in soup.find_all('label'):
-            t = self._norm(lab.get_text(" "))
+        for texto in textos:
+            t = self._norm(texto)
             if t and len(t) > 2 and t != "SELECIONE":
                 bairros.append(t)
         
         bairros = sorted(list(set(bairros)))
         self.parser.update_bairros_disponiveis(bairros)
-        logger.info(f"✅ Bairros detectados: {len(bairros)}")
+        logger.info("Bairros detectados: %d", len(bairros), extra={'icon': '✅'})
         return bairros
 
     @log_method
@@ -296,34 +317,48 @@ class CaixaScraper:
         return r.text
 
     def _extrair_ids_e_paginacao(self, html: str) -> Tuple[Dict[int, str], int, int]:
-        soup = BeautifulSoup(html, 'html.parser')
+        if LexborHTMLParser is not None:
+            tree = LexborHTMLParser(html)
+            total_pag_elem = tree.css_first('#hdnQtdPag')
+            total_reg_elem = tree.css_first('#hdnQtdRegistros')
+            total_pag = total_pag_elem.attributes.get('value') if total_pag_elem is not None else None
+            total_reg = total_reg_elem.attributes.get('value') if total_reg_elem is not None else None
+            inputs = [inp.attributes for inp in tree.css('input[id^="hdnImov"]')]
+        else:
+            soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer(id=_RE_ID_PAGINACAO))
+            total_pag_elem = soup.find(id="hdnQtdPag")
+            total_reg_elem = soup.find(id="hdnQtdRegistros")
+            total_pag = total_pag_elem.get('value') if total_pag_elem else None
+            total_reg = total_reg_elem.get('value') if total_reg_elem else None
+            inputs = [inp.attrs for inp in soup.find_all('input')]
+
         ids_por_pagina: Dict[int, str] = {}
         total_paginas = 1
         total_registros = 0
 
         
         try:
-            total_pag_elem = soup.find(id="hdnQtdPag")
-            if total_pag_elem and total_pag_elem.get('value'):
-                total_paginas = int(total_pag_elem.get('value'))
+            if total_pag:
+                total_paginas = int(total_pag)
         except Exception:
             pass
         try:
-            total_reg_elem = soup.find(id="hdnQtdRegistros")
-            if total_reg_elem and total_reg_elem.get('value'):
-                total_registros = int(total_reg_elem.get('value'))
+            if total_reg:
+                total_registros = int(total_reg)
         except Exception:
             pass
 
         
-        for inp in soup.find_all('input'):
-            iid = inp.get('id') or ''
-            if iid.startswith('hdnImov'):
-                try:
-                    idx = int(iid.replace('hdnImov', ''))
-                    ids_por_pagina[idx] = (inp.get('value') or '').strip()
-                except Exception:
-                    continue
+        for attrs in inputs:
+            iid = attrs.get('id')
+            if not iid or not iid.startswith(_PREFIXO_IMOV):
+                continue
+            try:
+                idx = int(iid[len(_PREFIXO_IMOV):])
+            except ValueError:
+                continue
+            valor = attrs.get('value')
+            ids_por_pagina[idx] = valor.strip() if valor else ''
         return ids_por_pagina, total_paginas, total_registros
 
     @log_method
@@ -332,15 +367,31 @@ class CaixaScraper:
         r = self._post(URL_LISTA, payload)
         return r.text
 
+    def _aguardar_cadencia(self):
+        with self._cadencia_lock:
+            agora = time.monotonic()
+            espera = self._proxima_pagina - agora
+            self._proxima_pagina = max(agora, self._proxima_pagina) + self.delay_between_requests
+        if espera > 0:
+            time.sleep(espera)
+
+    def _baixar_pagina(self, ids_da_pagina: str) -> str:
+        self._aguardar_cadencia()
+        return self._carregar_pagina_fragmento(ids_da_pagina)
+
     def debug_save_html(self, html_content, filename="debug_page.html"):
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(html_content)
-        logger.info(f"HTML salvo para debug: {filename}")
+        logger.info("HTML salvo para debug: %s", filename)
 
     @log_method
     def extract_imoveis_da_pag(self, html_content):
         return self.html_extractor.extract_imoveis_da_pag(html_content)
 
+    @log_method
+    def extract_imoveis_do_fragmento(self, fragmento):
+        return self.html_extractor.extract_imoveis_do_fragmento(fragmento)
+
     @log_method
     def scrapeImoveis(self):
         self._init_session()
@@ -350,37 +401,40 @@ class CaixaScraper:
         try:
             self._obter_bairros(self.estado, cod_cidade)
         except Exception as e:
-            logger.warning(f"Falha ao obter bairros: {e}")
+            logger.warning("Falha ao obter bairros: %s", e)
 
         
         html_inicio = self._iniciar_pesquisa(self.estado, cod_cidade)
-        self.debug_save_html(html_inicio, "debug_results_http.html")
+        if logger.isEnabledFor(logging.DEBUG):
+            self.debug_save_html(html_inicio, "debug_results_http.html")
         ids_por_pagina, total_paginas, total_registros = self._extrair_ids_e_paginacao(html_inicio)
 
         if not ids_por_pagina:
             logger.warning("Não foram encontrados IDs de imóveis por página (hdnImovN)")
 
-        logger.info("📊 Paginação detectada:")
-        logger.info(f"   Total de páginas: {total_paginas}")
-        logger.info(f"   Total de imóveis (site): {total_registros}")
+        logger.info("Paginação detectada:", extra={'icon': '📊'})
+        logger.info("   Total de páginas: %s", total_paginas)
+        logger.info("   Total de imóveis (site): %s", total_registros)
 
         
-        todos_imoveis = []
-        for page_num in tqdm(range(1, total_paginas + 1), desc="Páginas", unit="pág"):
+        paginas = []
+        for page_num in range(1, total_paginas + 1):
             ids = ids_por_pagina.get(page_num, "")
             if not ids:
-                logger.warning(f"Sem IDs para a página {page_num}, pulando...")
+                logger.warning("Sem IDs para a página %s, pulando...", page_num)
                 continue
+            paginas.append(ids)
 
-            frag = self._carregar_pagina_fragmento(ids)
-            
-            wrapped_html = f"<div id='listaimoveispaginacao'>{frag}</div>"
-            imoveis = self.extract_imoveis_da_pag(wrapped_html)
-            todos_imoveis.extend(imoveis)
-            time.sleep(self.delay_between_requests)
+        
+        todos_imoveis = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            fragmentos = pool.map(self._baixar_pagina, paginas)
+            for frag in tqdm(fragmentos, total=len(paginas), desc="Páginas", unit="pág"):
+                imoveis = self.extract_imoveis_do_fragmento(frag)
+                todos_imoveis.extend(imoveis)
 
         self.imoveis_scraped = todos_imoveis
-        logger.info(f"Total de imóveis extraídos: {len(self.imoveis_scraped)}")
+        logger.info("Total de imóveis extraídos: %d", len(self.imoveis_scraped))
         return self.imoveis_scraped
 
     
@@ -391,16 +445,19 @@ class CaixaScraper:
             return None
 
         if filename is None:
-            filename = f"imoveis_{self.estado.lower()}_{self.cidade.lower().replace(' ', '_')}.csv"
+            filename = f"imoveis_{self._slug}.csv"
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename_with_timestamp = f"{filename.replace('.csv', '')}_{timestamp}.csv"
 
         
-        df = pd.DataFrame(self.imoveis_scraped)
+        campos = list(dict.fromkeys(k for imovel in self.imoveis_scraped for k in imovel))
 
         
-        df.to_csv(filename_with_timestamp, index=False, encoding='utf-8')
+        with open(filename_with_timestamp, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=campos, lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(self.imoveis_scraped)
 
         return filename_with_timestamp
 
@@ -411,7 +468,7 @@ class CaixaScraper:
             return None
 
         if filename is None:
-            filename = f"imoveis_{self.estado.lower()}_{self.cidade.lower().replace(' ', '_')}.json"
+            filename = f"imoveis_{self._slug}.json"
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename_with_timestamp = f"{filename.replace('.json', '')}_{timestamp}.json"
@@ -425,8 +482,12 @@ class CaixaScraper:
         }
 
         
-        with open(filename_with_timestamp, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(filename_with_timestamp, 'wb') as f:
+                f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename_with_timestamp, 'w', encoding='utf-8') as f:
+                json.dump(export_data, f, ensure_ascii=False, indent=2)
 
         return filename_with_timestamp
 
@@ -439,10 +500,15 @@ class CaixaScraper:
         print(f"Total de imóveis: {len(self.imoveis_scraped)}")
 
 
-        imoveis_com_valor = [p for p in self.imoveis_scraped if p.get('valor')]
-        imoveis_com_endereco = [p for p in self.imoveis_scraped if p.get('endereco')]
-        imoveis_com_area = [p for p in self.imoveis_scraped if p.get('area')]
+        com_valor = com_endereco = com_area = 0
+        for p in self.imoveis_scraped:
+            if p.get('valor'):
+                com_valor += 1
+            if p.get('endereco'):
+                com_endereco += 1
+            if p.get('area'):
+                com_area += 1
 
-        print(f"Com valor preenchido: {len(imoveis_com_valor)}")
-        print(f"Com endereço preenchido: {len(imoveis_com_endereco)}")
-        print(f"Com área preenchida: {len(imoveis_com_area)}")
\ No newline at end of file
+        print(f"Com valor preenchido: {com_valor}")
+        print(f"Com endereço preenchido: {com_endereco}")
+        print(f"Com área preenchida: {com_area}")
\ No newline at end of file
@@ -0,0 +1,88 @@
+import logging
+import unittest
+
+from bs4 import BeautifulSoup
+
+from logger_config import ConsoleFormatter, LeanFileFormatter, _short, log_method
+
+
+class _Falha:
+    def __init__(self, logger):
+        self.logger = logger
+
+    @log_method
+    def executar(self):
+        raise ValueError("boom")
+
+
+class _Captura(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class LogMethodErroTest(unittest.TestCase):
+
+    def setUp(self):
+        nivel_desativado = logging.root.manager.disable
+        logging.disable(logging.NOTSET)
+        self.addCleanup(logging.disable, nivel_desativado)
+
+    def _erros(self, level):
+        logger = logging.getLogger(f'test_log_method_{level}')
+        logger.propagate = False
+        logger.setLevel(level)
+        captura = _Captura()
+        logger.addHandler(captura)
+        self.addCleanup(logger.removeHandler, captura)
+        with self.assertRaises(ValueError):
+            _Falha(logger).executar()
+        return [r for r in captura.records if r.levelno >= logging.ERROR]
+
+    def test_erro_igual_em_qualquer_nivel(self):
+        mensagens = []
+        for level in (logging.INFO, logging.WARNING):
+            with self.subTest(level=level):
+                erros = self._erros(level)
+                self.assertEqual(len(erros), 1)
+                self.assertIsNotNone(erros[0].exc_info)
+                mensagens.append(erros[0].msg)
+        self.assertEqual(mensagens[0], mensagens[1])
+        self.assertIn("após", mensagens[0])
+
+
+class ShortTest(unittest.TestCase):
+
+    def test_tag_mostra_so_a_abertura(self):
+        soup = BeautifulSoup('<div id="lista" class="a b">' + '<p>x</p>' * 1000 + '</div>', 'lxml')
+        self.assertEqual(_short(soup.div), '<div id="lista" class="a b">')
+
+    def test_outros_valores(self):
+        self.assertEqual(_short('x' * 80), 'x' * 50)
+        self.assertEqual(_short(3.5), '3.5')
+        self.assertLessEqual(len(_short(list(range(1000)))), 50)
+
+
+class FormatadoresTest(unittest.TestCase):
+
+    def _record(self, **extra):
+        record = logging.makeLogRecord({'msg': 'Concluído %s', 'args': ('x ✓',), 'levelno': logging.INFO,
+                                        'levelname': 'INFO', 'created': 0})
+        record.__dict__.update(extra)
+        return record
+
+    def test_icone_so_no_console(self):
+        console = ConsoleFormatter('%(icon_prefix)s%(message)s')
+        record = self._record(icon='✅')
+        self.assertEqual(console.format(record), '✅ Concluído x ✓')
+        self.assertEqual(LeanFileFormatter().format(record), '0|I|Concluído x ✓')
+
+    def test_sem_icone(self):
+        self.assertEqual(ConsoleFormatter('%(icon_prefix)s%(message)s').format(self._record()), 'Concluído x ✓')
+
+
+if __name__ == '__main__':
+    unittest.main()
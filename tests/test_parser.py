@@ -0,0 +1,120 @@
+import logging
+import unittest
+from unittest import mock
+
+import parser as caixa_parser
+from parser import CaixaHtmlExtractor, CaixaPropertyParser
+
+logging.disable(logging.CRITICAL)
+
+
+ITEM = """<li class="group-block-item"><div class="dadosimovel-col2">
+<ul class="form-set"><li><a href="#"><strong>SAO PAULO - VILA MARIANA | R$ 250.000,00</strong></a></li></ul>
+<div><font>Casa - Venda Direta Online<br>
+Casa, 80,00 m2 de área total<br></font></div>
+<script>window.quartos='9 quartos'</script><style>.q:after{content:'5 quartos'}</style>
+<span>Número do imóvel: 1444400000001-2<br><strong>Número do item: 3</strong>
+RUA DOMINGOS DE MORAIS, N. 10, , VILA MARIANA<br></span>
+</div></li>"""
+
+ESPERADO = {
+    'codigo': '1444400000001-2',
+    'titulo': 'SAO PAULO - VILA MARIANA',
+    'endereco': 'RUA DOMINGOS DE MORAIS, N. 10, , VILA MARIANA',
+    'bairro': 'VILA MARIANA',
+    'modalidade': 'Venda Direta',
+    'valor': 'R$ 250.000,00',
+    'area': '',
+    'quartos': '',
+    'tipo_imovel': 'Casa',
+    'numero_item': '3',
+}
+
+BACKENDS_HTML = {
+    'lexbor': caixa_parser.LexborHTMLParser,
+    'bs4': None,
+}
+
+BACKENDS_BAIRRO = {
+    'ahocorasick': caixa_parser.ahocorasick,
+    'trie': None,
+}
+
+
+class ExtracaoItensTest(unittest.TestCase):
+
+    def _extrair(self, backend, html, fragmento):
+        with mock.patch.object(caixa_parser, 'LexborHTMLParser', BACKENDS_HTML[backend]):
+            extractor = CaixaHtmlExtractor(CaixaPropertyParser(['VILA', 'VILA MARIANA']))
+            if fragmento:
+                return extractor.extract_imoveis_do_fragmento(html)
+            return extractor.extract_imoveis_da_pag(html)
+
+    def test_fragmento_ignora_script_e_style(self):
+        for backend in BACKENDS_HTML:
+            with self.subTest(backend=backend):
+                self.assertEqual(self._extrair(backend, ITEM, fragmento=True), [ESPERADO])
+
+    def test_pagina_ignora_script_e_style(self):
+        pagina = f"<div id='listaimoveispaginacao'>{ITEM}</div>"
+        for backend in BACKENDS_HTML:
+            with self.subTest(backend=backend):
+                self.assertEqual(self._extrair(backend, pagina, fragmento=False), [ESPERADO])
+
+
+class PaginaFormularioTest(unittest.TestCase):
+
+    TABELA = '<table><tr><td>123</td><td>RUA A 1</td><td>R$ 10</td><td>50 m²</td></tr></table>'
+
+    def _extrair(self, backend, html):
+        with mock.patch.object(caixa_parser, 'LexborHTMLParser', BACKENDS_HTML[backend]):
+            return CaixaHtmlExtractor(CaixaPropertyParser()).extract_imoveis_da_pag(html)
+
+    def test_formulario_retorna_vazio(self):
+        html = '<html><body>\n<p>Selecione a modalidade de venda</p>\n' + self.TABELA + '</body></html>'
+        for backend in BACKENDS_HTML:
+            with self.subTest(backend=backend):
+                self.assertEqual(self._extrair(backend, html), [])
+
+    def test_pagina_minificada_nao_e_formulario(self):
+        html = (
+            '<html><body><select><option>Selecione</option></select><input name="modalidade">'
+            '<a href="https://venda-imoveis.caixa.gov.br/">x</a>' + self.TABELA + '</body></html>'
+        )
+        for backend in BACKENDS_HTML:
+            with self.subTest(backend=backend):
+                imoveis = self._extrair(backend, html)
+                self.assertEqual([imovel['codigo'] for imovel in imoveis], ['123'])
+
+    def test_frase_dividida_entre_elementos_nao_e_formulario(self):
+        html = (
+            '<html><body><label>Selecione o filtro</label><span>modalidade</span>'
+            '<b>Venda Direta</b>' + self.TABELA + '</body></html>'
+        )
+        for backend in BACKENDS_HTML:
+            with self.subTest(backend=backend):
+                imoveis = self._extrair(backend, html)
+                self.assertEqual([imovel['codigo'] for imovel in imoveis], ['123'])
+
+
+class DeteccaoBairroTest(unittest.TestCase):
+
+    BAIRROS = ['VILA', 'VILA MARIA', 'VILA MARIANA', 'JARDIM', 'JARDIM ANGELA', 'ANGELA']
+
+    CASOS = [
+        ('RUA A, 10, , VILA MARIANA', 'VILA MARIANA'),
+        ('RUA B, VILA MARIA - SAO PAULO', 'VILA MARIA'),
+        ('ESTRADA DO M BOI MIRIM, JARDIM ANGELA', 'JARDIM ANGELA'),
+        ('rua c, vila', 'VILA'),
+    ]
+
+    def test_backends_concordam(self):
+        for backend, modulo in BACKENDS_BAIRRO.items():
+            with self.subTest(backend=backend), mock.patch.object(caixa_parser, 'ahocorasick', modulo):
+                parser = CaixaPropertyParser(self.BAIRROS)
+                for endereco, esperado in self.CASOS:
+                    self.assertEqual(parser.detect_bairro_from_endereco(endereco), esperado, endereco)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import importlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+logging.disable(logging.CRITICAL)
+
+script = None
+
+
+def setUpModule():
+    global script
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            script = importlib.import_module('script')
+        finally:
+            os.chdir(cwd)
+
+
+PAGINA_PESQUISA = """<form>
+<input type="hidden" id="hdnQtdPag" value="3">
+<input type="hidden" id="hdnQtdRegistros" value="55">
+<input type="hidden" id="hdnImov1" value=" 101||102 ">
+<input type="hidden" id="hdnImov2" value="103">
+<input type="hidden" id="hdnImovX" value="999">
+<input type="hidden" id="hdnImov3">
+<div><input type="text" id="outro" value="x"></div>
+</form>"""
+
+PAGINA_BAIRROS = """<div>
+<input type="checkbox" id="b1"><label for="b1">Vila <b>Mariana</b></label>
+<label>  JARDIM&nbsp;PAULISTA </label>
+<label>Sé Catedral<script>var x = 'PINHEIROS';</script><style>.a{}</style></label>
+<label>AB</label><label>Selecione</label>
+</div>"""
+
+
+class _Resposta:
+    def __init__(self, text):
+        self.text = text
+
+
+class BackendsScriptTest(unittest.TestCase):
+
+    def setUp(self):
+        self.backends = {'lexbor': script.LexborHTMLParser, 'bs4': None}
+        self.scraper = script.CaixaScraper.__new__(script.CaixaScraper)
+        self.scraper.session = object()
+        self.scraper.parser = script.CaixaPropertyParser()
+
+    def test_extrair_ids_e_paginacao(self):
+        esperado = ({1: '101||102', 2: '103', 3: ''}, 3, 55)
+        for backend, modulo in self.backends.items():
+            with self.subTest(backend=backend), mock.patch.object(script, 'LexborHTMLParser', modulo):
+                self.assertEqual(self.scraper._extrair_ids_e_paginacao(PAGINA_PESQUISA), esperado)
+
+    def test_obter_bairros(self):
+        self.scraper._post = lambda url, payload: _Resposta(PAGINA_BAIRROS)
+        esperado = ['JARDIM PAULISTA', 'SÉ CATEDRAL', 'VILA MARIANA']
+        for backend, modulo in self.backends.items():
+            with self.subTest(backend=backend), mock.patch.object(script, 'LexborHTMLParser', modulo):
+                self.assertEqual(self.scraper._obter_bairros('SP', '9859'), esperado)
+
+
+class SessaoTest(unittest.TestCase):
+
+    def _maxsize(self, max_workers):
+        scraper = script.CaixaScraper.__new__(script.CaixaScraper)
+        scraper.max_workers = max_workers
+        scraper.ua = mock.Mock(random='agente')
+        scraper.search_url = script.BUSCA_URL
+        with mock.patch.object(script.requests.Session, 'get'):
+            session = scraper._nova_sessao()
+        adapter = session.get_adapter("https://venda-imoveis.caixa.gov.br/")
+        return adapter.poolmanager.connection_pool_kw["maxsize"]
+
+    def test_pool_nunca_abaixo_do_padrao(self):
+        self.assertEqual(self._maxsize(4), 10)
+
+    def test_pool_acompanha_os_workers(self):
+        self.assertEqual(self._maxsize(16), 16)
+
+
+class CadenciaTest(unittest.TestCase):
+
+    def test_workers_compartilham_a_cadencia(self):
+        scraper = script.CaixaScraper.__new__(script.CaixaScraper)
+        scraper.delay_between_requests = 0.05
+        scraper._cadencia_lock = threading.Lock()
+        scraper._proxima_pagina = 0.0
+        inicios = []
+
+        def carregar(ids):
+            inicios.append(time.monotonic())
+            time.sleep(0.1)
+            return ids
+
+        scraper._carregar_pagina_fragmento = carregar
+        paginas = [str(i) for i in range(6)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            self.assertEqual(list(pool.map(scraper._baixar_pagina, paginas)), paginas)
+        inicios.sort()
+        for anterior, seguinte in zip(inicios, inicios[1:]):
+            self.assertGreaterEqual(seguinte - anterior, 0.045)
+
+
+if __name__ == '__main__':
+    unittest.main()